@@ -1,10 +1,10 @@
 import sqlite3
 import json
 import os
+from datetime import date, timedelta
 from faker import Faker
 import random
-from sqlalchemy import create_engine, MetaData, Table, insert, select
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event, MetaData, Table, insert, text
 
 # Initialize Faker
 fake = Faker()
@@ -73,6 +73,13 @@ create_commands = (
     """
 )
 
+# SQL commands to create indexes, run once the data is loaded so SQLite
+# does not have to maintain them on every insert
+index_commands = (
+    "CREATE INDEX IF NOT EXISTS idx_workorders_productid ON WorkOrders (ProductID);",
+    "CREATE INDEX IF NOT EXISTS idx_qualitycontrol_orderid ON QualityControl (OrderID);"
+)
+
 # Function to execute create commands
 def create_tables():
     try:
@@ -99,90 +106,146 @@ product_names = data_pools['product_names']
 product_description = data_pools['product_descriptions']
 qc_comments = data_pools['qc_comments']
 
+# Value choices and row counts for the generated tables
+machine_type_choices = ('Type A', 'Type B', 'Type C')
+machine_status_choices = ('running', 'idle', 'maintenance')
+work_order_status_choices = ('pending', 'in progress', 'completed', 'cancelled')
+employee_role_choices = ('Operator', 'Technician', 'Manager')
+employee_shift_choices = ('morning', 'evening', 'night')
+qc_result_choices = ('pass', 'fail', 'rework')
+num_machines = 5
+num_work_orders = 20
+num_employees = 10
+num_quality_checks = 20
+
 # Insert synthetic data
-def insert_data():
+def insert_data(fast_mode=True):
     create_tables()  # Create tables first
 
     # Create database engine
     engine = create_engine(f'sqlite:///{db_file}', echo=False)
 
+    # Bulk-load settings for the generator's connections: keep the rollback
+    # journal in memory and skip fsyncs, since the data can be regenerated.
+    # Pass fast_mode=False to keep SQLite's default durability settings
+    if fast_mode:
+        @event.listens_for(engine, "connect")
+        def set_sqlite_pragmas(dbapi_connection, connection_record):
+            dbapi_connection.execute("PRAGMA journal_mode=MEMORY")
+            dbapi_connection.execute("PRAGMA synchronous=OFF")
+            dbapi_connection.execute("PRAGMA temp_store=MEMORY")
+
     # Reflect the tables from the database
     metadata = MetaData()
     metadata.reflect(bind=engine)
 
-    # Create a Session class bound to the engine
-    Session = sessionmaker(bind=engine)
-    session = Session()
+    # Use one Core connection for the whole load; the ORM session adds
+    # unit-of-work bookkeeping that plain inserts do not need
+    connection = engine.connect()
+
+    # Date range for the generated records, fixed once per run
+    today = date.today()
+    last_year = today - timedelta(days=365)
+    next_year = today + timedelta(days=365)
 
     try:
         # Products
         products_table = metadata.tables['Products']
+        products_insert = insert(products_table).returning(products_table.c.ProductID)
+        product_rows = []
         for name, description in zip(product_names, product_description):
-            session.execute(insert(products_table).values(Name=name, Description=description))
-        session.commit()
-        product_ids = fetch_product_ids(session, metadata)
+            product_rows.append({'Name': name, 'Description': description})
+        product_ids = connection.execute(products_insert, product_rows).scalars().all()
 
         # Machines
         machines_table = metadata.tables['Machines']
-        for i in range(1, 6):  # Generating 5 machines
-            session.execute(insert(machines_table).values(Name=f'Machine {i}', Type=random.choice(['Type A', 'Type B', 'Type C']), Status=random.choice(['running', 'idle', 'maintenance'])))
-        session.commit()
+        machines_insert = insert(machines_table)
+        machine_rows = []
+        machine_types = random.choices(machine_type_choices, k=num_machines)
+        machine_statuses = random.choices(machine_status_choices, k=num_machines)
+        for i, (machine_type, status) in enumerate(zip(machine_types, machine_statuses), start=1):
+            machine_rows.append({'Name': f'Machine {i}', 'Type': machine_type, 'Status': status})
+        connection.execute(machines_insert, machine_rows)
 
         # Inventory
         inventory_table = metadata.tables['Inventory']
-        for name in inventory_names:
-            session.execute(insert(inventory_table).values(Name=name, Quantity=random.randint(0, 1000), ReorderLevel=random.randint(10, 100)))
-        session.commit()
+        inventory_insert = insert(inventory_table)
+        inventory_rows = []
+        quantities = random.choices(range(0, 1001), k=len(inventory_names))
+        reorder_levels = random.choices(range(10, 101), k=len(inventory_names))
+        for name, quantity, reorder_level in zip(inventory_names, quantities, reorder_levels):
+            inventory_rows.append({'Name': name, 'Quantity': quantity, 'ReorderLevel': reorder_level})
+        connection.execute(inventory_insert, inventory_rows)
 
         # Work Orders
         work_orders_table = metadata.tables['WorkOrders']
-        for _ in range(20):  # 20 work orders
-            product_id = random.choice(product_ids)
-            session.execute(insert(work_orders_table).values(
-                ProductID=product_id,
-                Quantity=random.randint(1, 100),
-                StartDate=fake.date_between(start_date='-1y', end_date='today').isoformat(),
-                EndDate=fake.date_between(start_date='today', end_date='+1y').isoformat(),
-                Status=random.choice(['pending', 'in progress', 'completed', 'cancelled'])
-            ))
-        session.commit()
-        order_ids = fetch_order_ids(session, metadata)
+        work_orders_insert = insert(work_orders_table).returning(work_orders_table.c.OrderID)
+        work_order_rows = []
+        order_products = random.choices(product_ids, k=num_work_orders)
+        order_quantities = random.choices(range(1, 101), k=num_work_orders)
+        order_start_dates = random_dates(last_year, today, k=num_work_orders)
+        order_end_dates = random_dates(today, next_year, k=num_work_orders)
+        order_statuses = random.choices(work_order_status_choices, k=num_work_orders)
+        order_columns = zip(order_products, order_quantities, order_start_dates, order_end_dates, order_statuses)
+        for product_id, quantity, start_date, end_date, status in order_columns:
+            work_order_rows.append({
+                'ProductID': product_id,
+                'Quantity': quantity,
+                'StartDate': start_date,
+                'EndDate': end_date,
+                'Status': status
+            })
+        order_ids = connection.execute(work_orders_insert, work_order_rows).scalars().all()
 
         # Employees
         employees_table = metadata.tables['Employees']
-        for _ in range(10):  # 10 employees
-            session.execute(insert(employees_table).values(
-                Name=fake.name(),
-                Role=random.choice(['Operator', 'Technician', 'Manager']),
-                Shift=random.choice(['morning', 'evening', 'night'])
-            ))
-        session.commit()
+        employees_insert = insert(employees_table)
+        employee_rows = []
+        employee_roles = random.choices(employee_role_choices, k=num_employees)
+        employee_shifts = random.choices(employee_shift_choices, k=num_employees)
+        for role, shift in zip(employee_roles, employee_shifts):
+            employee_rows.append({
+                'Name': fake.name(),
+                'Role': role,
+                'Shift': shift
+            })
+        connection.execute(employees_insert, employee_rows)
 
         # Quality Control
         quality_control_table = metadata.tables['QualityControl']
-        for _ in range(20):
-            session.execute(insert(quality_control_table).values(
-                OrderID=random.choice(order_ids),
-                Date=fake.date_between(start_date='-1y', end_date='today').isoformat(),
-                Result=random.choice(['pass', 'fail', 'rework']),
-                Comments=random.choice(qc_comments)
-            ))
-        session.commit()
+        quality_control_insert = insert(quality_control_table)
+        quality_control_rows = []
+        check_orders = random.choices(order_ids, k=num_quality_checks)
+        check_dates = random_dates(last_year, today, k=num_quality_checks)
+        check_results = random.choices(qc_result_choices, k=num_quality_checks)
+        check_comments = random.choices(qc_comments, k=num_quality_checks)
+        for order_id, check_date, result, comments in zip(check_orders, check_dates, check_results, check_comments):
+            quality_control_rows.append({
+                'OrderID': order_id,
+                'Date': check_date,
+                'Result': result,
+                'Comments': comments
+            })
+        connection.execute(quality_control_insert, quality_control_rows)
+
+        # Indexes and foreign key check, after the bulk load
+        for command in index_commands:
+            connection.execute(text(command))
+        violations = connection.execute(text("PRAGMA foreign_key_check")).fetchall()
+        if violations:
+            raise ValueError(f"Foreign key violations: {violations}")
+        connection.commit()
 
     except Exception as e:
-        session.rollback()
+        connection.rollback()
         print(f"An error occurred: {e}")
     finally:
-        session.close()
-
-# Helper functions for fetching IDs
-def fetch_product_ids(session, metadata):
-    products_table = metadata.tables['Products']
-    return [id[0] for id in session.execute(select(products_table.c.ProductID)).fetchall()]
+        connection.close()
 
-def fetch_order_ids(session, metadata):
-    work_orders_table = metadata.tables['WorkOrders']
-    return [id[0] for id in session.execute(select(work_orders_table.c.OrderID)).fetchall()]
+# Helper function for drawing k ISO dates between two dates, inclusive
+def random_dates(start_date, end_date, k):
+    ordinals = random.choices(range(start_date.toordinal(), end_date.toordinal() + 1), k=k)
+    return [date.fromordinal(ordinal).isoformat() for ordinal in ordinals]
 
 if __name__ == '__main__':
     insert_data()